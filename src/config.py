@@ -15,15 +15,16 @@ Application settings:
 - DATABASE_PATH: Path to SQLite file (default: ./data/sessions.db)
 - REQUEST_TIMEOUT: Timeout for Langflow requests in seconds (default: 300)
 - SESSION_TTL_HOURS: Cleanup sessions after X hours (default: 24)
+- MAX_CONCURRENT_REQUESTS: Max Langflow requests in flight at once (default: 10)
 - ADMIN_USER_IDS: Comma-separated list of Slack user IDs who can manage flows
 - LOG_LEVEL: Logging level (default: INFO)
 """
 
 import logging
-from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -44,6 +45,8 @@ class Settings(BaseSettings):
     database_path: str = "./data/sessions.db"
     request_timeout: int = 300  # 5 minutes - agents can take long
     session_ttl_hours: int = 24  # Cleanup sessions after 24 hours
+    # Langflow runs in flight at once; 0 would block every request forever
+    max_concurrent_requests: int = Field(default=10, ge=1)
 
     # Admin Configuration (comma-separated Slack user IDs)
     admin_user_ids: str = ""
@@ -51,12 +54,25 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
 
+    # Parsed admin_user_ids, computed once in model_post_init
+    _admin_users: frozenset[str] = PrivateAttr(default_factory=frozenset)
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
+        # Settings are read-only after load; defaults are already well-typed
+        frozen=True,
+        extra="ignore",
+        validate_default=False,
     )
 
+    def model_post_init(self, __context: Any) -> None:
+        """Parse derived values once after settings are loaded."""
+        self._admin_users = frozenset(
+            uid.strip() for uid in self.admin_user_ids.split(",") if uid.strip()
+        )
+
     @property
     def has_default_flow_config(self) -> bool:
         """Check if default flow configuration is provided via env vars."""
@@ -67,18 +83,16 @@ class Settings(BaseSettings):
         ])
 
     @property
-    def admin_users(self) -> set[str]:
+    def admin_users(self) -> frozenset[str]:
         """Returns set of admin user IDs."""
-        if not self.admin_user_ids:
-            return set()
-        return {uid.strip() for uid in self.admin_user_ids.split(",") if uid.strip()}
+        return self._admin_users
 
     def is_admin(self, user_id: str) -> bool:
         """Check if a user is an admin."""
         # If no admins configured, allow all users (for backward compatibility)
-        if not self.admin_users:
+        if not self._admin_users:
             return True
-        return user_id in self.admin_users
+        return user_id in self._admin_users
 
     def ensure_data_directory(self) -> None:
         """Ensures the data directory exists for the SQLite database."""
@@ -86,14 +100,27 @@ class Settings(BaseSettings):
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
 
-@lru_cache
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
-    """Returns cached settings instance."""
-    return Settings()
+    """Returns the process-wide settings instance, loading it on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+_logging_configured = False
 
 
 def setup_logging(level: str = "INFO") -> None:
-    """Configures structured logging for the application."""
+    """Configures structured logging for the application (first call only)."""
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
     log_level = getattr(logging, level.upper(), logging.INFO)
 
     logging.basicConfig(
@@ -21,18 +21,26 @@ Database Schema:
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         FOREIGN KEY (flow_name) REFERENCES flows(name)
     );
+    CREATE INDEX idx_channel_flows_flow_name ON channel_flows(flow_name);
+    CREATE INDEX idx_flows_is_default ON flows(is_default) WHERE is_default = TRUE;
 """
 
 import logging
 import re
-from dataclasses import dataclass
-from datetime import datetime
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Optional
 
 import aiosqlite
 
 logger = logging.getLogger(__name__)
 
+# Matches Slack-wrapped URLs: <https://example.com> or <https://example.com|label>
+_SLACK_URL_RE = re.compile(r"<(https?://[^|>]+)(?:\|[^>]*)?>")
+
+# Maximum entries kept in each of FlowManager's in-process caches
+_CACHE_MAXSIZE = 256
+
 
 def clean_slack_formatting(text: str) -> str:
     """
@@ -49,11 +57,10 @@ def clean_slack_formatting(text: str) -> str:
     """
     # Remove <url> formatting (e.g., <https://example.com> -> https://example.com)
     # Also handles <url|label> format (e.g., <https://example.com|example.com>)
-    cleaned = re.sub(r'<(https?://[^|>]+)(?:\|[^>]*)?>',  r'\1', text)
-    return cleaned.strip()
+    return _SLACK_URL_RE.sub(r"\1", text).strip()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FlowConfig:
     """Configuration for a Langflow flow."""
     name: str
@@ -62,12 +69,24 @@ class FlowConfig:
     api_key: str
     description: Optional[str] = None
     is_default: bool = False
+    # Full run endpoint URL, computed once from langflow_url and flow_id
+    endpoint: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def endpoint(self) -> str:
-        """Returns the full run endpoint URL."""
+    def __post_init__(self) -> None:
         base = self.langflow_url.rstrip("/")
-        return f"{base}/api/v1/run/{self.flow_id}"
+        object.__setattr__(self, "endpoint", f"{base}/api/v1/run/{self.flow_id}")
+
+    @classmethod
+    def from_row(cls, row: aiosqlite.Row) -> "FlowConfig":
+        """Build a FlowConfig from a row of the flows table."""
+        return cls(
+            name=row["name"],
+            langflow_url=row["langflow_url"],
+            flow_id=row["flow_id"],
+            api_key=row["api_key"],
+            description=row["description"],
+            is_default=bool(row["is_default"]),
+        )
 
 
 class FlowManager:
@@ -82,41 +101,111 @@ class FlowManager:
         """
         self.database_path = database_path
         self._initialized = False
+        # Long-lived connection, opened in initialize() and closed in close()
+        self._db: Optional[aiosqlite.Connection] = None
+        # LRU caches in front of the read paths (flow name / channel ID -> FlowConfig)
+        self._flow_cache: OrderedDict[str, FlowConfig] = OrderedDict()
+        self._channel_cache: OrderedDict[str, FlowConfig] = OrderedDict()
 
     async def initialize(self) -> None:
-        """Initialize the database tables."""
+        """Open the database connection and initialize the tables."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.database_path) as db:
-            # Create flows table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS flows (
-                    name TEXT PRIMARY KEY,
-                    langflow_url TEXT NOT NULL,
-                    flow_id TEXT NOT NULL,
-                    api_key TEXT NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_default BOOLEAN DEFAULT FALSE
-                )
-            """)
-
-            # Create channel_flows table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS channel_flows (
-                    channel_id TEXT PRIMARY KEY,
-                    flow_name TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (flow_name) REFERENCES flows(name)
-                )
-            """)
+        self._db = await aiosqlite.connect(
+            self.database_path, cached_statements=256
+        )
+        self._db.row_factory = aiosqlite.Row
+
+        db = self._db
+        # WAL + synchronous=NORMAL avoids a full fsync on every small write
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA temp_store=MEMORY")
+        await db.execute("PRAGMA cache_size=-8000")
+
+        # Create flows table
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS flows (
+                name TEXT PRIMARY KEY,
+                langflow_url TEXT NOT NULL,
+                flow_id TEXT NOT NULL,
+                api_key TEXT NOT NULL,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                is_default BOOLEAN DEFAULT FALSE
+            )
+        """)
+
+        # Create channel_flows table
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS channel_flows (
+                channel_id TEXT PRIMARY KEY,
+                flow_name TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (flow_name) REFERENCES flows(name)
+            )
+        """)
 
-            await db.commit()
+        # remove_flow deletes mappings by flow_name; get_default_flow filters
+        # on is_default (partial index holds at most one row)
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_channel_flows_flow_name "
+            "ON channel_flows(flow_name)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_flows_is_default "
+            "ON flows(is_default) WHERE is_default = TRUE"
+        )
+
+        await db.commit()
 
         self._initialized = True
         logger.info("Flow manager database initialized")
 
+    async def close(self) -> None:
+        """Close the database connection."""
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+            self._initialized = False
+
+    @staticmethod
+    def _cache_get(
+        cache: OrderedDict[str, FlowConfig], key: str
+    ) -> Optional[FlowConfig]:
+        """Look up a cache entry, marking it as most recently used."""
+        config = cache.get(key)
+        if config is not None:
+            cache.move_to_end(key)
+        return config
+
+    @staticmethod
+    def _cache_put(
+        cache: OrderedDict[str, FlowConfig], key: str, config: FlowConfig
+    ) -> None:
+        """Insert a cache entry, evicting the least recently used if full."""
+        cache[key] = config
+        cache.move_to_end(key)
+        if len(cache) > _CACHE_MAXSIZE:
+            cache.popitem(last=False)
+
+    def _invalidate_flows(self, name: Optional[str] = None) -> None:
+        """
+        Drop cached flow configs after a flow changes.
+
+        Channel lookups may resolve to any flow (including the default),
+        so the channel cache is always cleared.
+
+        Args:
+            name: Flow to drop, or None to drop every cached flow.
+        """
+        if name is None:
+            self._flow_cache.clear()
+        else:
+            self._flow_cache.pop(name, None)
+        self._channel_cache.clear()
+
     async def add_flow(
         self,
         name: str,
@@ -143,28 +232,31 @@ class FlowManager:
         # Clean Slack formatting from URL
         langflow_url = clean_slack_formatting(langflow_url)
 
-        async with aiosqlite.connect(self.database_path) as db:
-            try:
-                # If setting as default, unset any existing default
-                if is_default:
-                    await db.execute(
-                        "UPDATE flows SET is_default = FALSE WHERE is_default = TRUE"
-                    )
-
+        db = self._db
+        try:
+            # If setting as default, unset any existing default
+            if is_default:
                 await db.execute(
-                    """
-                    INSERT INTO flows (name, langflow_url, flow_id, api_key, description, is_default, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (name, langflow_url, flow_id, api_key, description, is_default, datetime.utcnow()),
+                    "UPDATE flows SET is_default = FALSE WHERE is_default = TRUE"
                 )
-                await db.commit()
-                logger.info("Added flow: %s", name)
-                return True
 
-            except aiosqlite.IntegrityError:
-                logger.warning("Flow already exists: %s", name)
-                return False
+            await db.execute(
+                """
+                INSERT INTO flows (name, langflow_url, flow_id, api_key, description, is_default)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (name, langflow_url, flow_id, api_key, description, is_default),
+            )
+            await db.commit()
+            self._invalidate_flows(None if is_default else name)
+            logger.info("Added flow: %s", name)
+            return True
+
+        except aiosqlite.IntegrityError:
+            # Undo the default reset so it isn't committed by a later write
+            await db.rollback()
+            logger.warning("Flow already exists: %s", name)
+            return False
 
     async def update_flow(
         self,
@@ -208,17 +300,18 @@ class FlowManager:
 
         params.append(name)
 
-        async with aiosqlite.connect(self.database_path) as db:
-            cursor = await db.execute(
-                f"UPDATE flows SET {', '.join(updates)} WHERE name = ?",
-                params,
-            )
-            await db.commit()
+        db = self._db
+        cursor = await db.execute(
+            f"UPDATE flows SET {', '.join(updates)} WHERE name = ?",
+            params,
+        )
+        await db.commit()
+        self._invalidate_flows(name)
 
-            if cursor.rowcount > 0:
-                logger.info("Updated flow: %s", name)
-                return True
-            return False
+        if cursor.rowcount > 0:
+            logger.info("Updated flow: %s", name)
+            return True
+        return False
 
     async def remove_flow(self, name: str) -> bool:
         """
@@ -230,21 +323,22 @@ class FlowManager:
         Returns:
             True if removed, False if not found.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            # First remove any channel mappings
-            await db.execute(
-                "DELETE FROM channel_flows WHERE flow_name = ?", (name,)
-            )
-
-            cursor = await db.execute(
-                "DELETE FROM flows WHERE name = ?", (name,)
-            )
-            await db.commit()
-
-            if cursor.rowcount > 0:
-                logger.info("Removed flow: %s", name)
-                return True
-            return False
+        db = self._db
+        # First remove any channel mappings
+        await db.execute(
+            "DELETE FROM channel_flows WHERE flow_name = ?", (name,)
+        )
+
+        cursor = await db.execute(
+            "DELETE FROM flows WHERE name = ?", (name,)
+        )
+        await db.commit()
+        self._invalidate_flows(name)
+
+        if cursor.rowcount > 0:
+            logger.info("Removed flow: %s", name)
+            return True
+        return False
 
     async def get_flow(self, name: str) -> Optional[FlowConfig]:
         """
@@ -256,23 +350,21 @@ class FlowManager:
         Returns:
             FlowConfig if found, None otherwise.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                "SELECT * FROM flows WHERE name = ?", (name,)
-            )
-            row = await cursor.fetchone()
-
-            if row:
-                return FlowConfig(
-                    name=row["name"],
-                    langflow_url=row["langflow_url"],
-                    flow_id=row["flow_id"],
-                    api_key=row["api_key"],
-                    description=row["description"],
-                    is_default=bool(row["is_default"]),
-                )
-            return None
+        cached = self._cache_get(self._flow_cache, name)
+        if cached is not None:
+            return cached
+
+        db = self._db
+        cursor = await db.execute(
+            "SELECT * FROM flows WHERE name = ?", (name,)
+        )
+        row = await cursor.fetchone()
+
+        if row:
+            flow = FlowConfig.from_row(row)
+            self._cache_put(self._flow_cache, name, flow)
+            return flow
+        return None
 
     async def get_default_flow(self) -> Optional[FlowConfig]:
         """
@@ -281,23 +373,15 @@ class FlowManager:
         Returns:
             Default FlowConfig if set, None otherwise.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                "SELECT * FROM flows WHERE is_default = TRUE LIMIT 1"
-            )
-            row = await cursor.fetchone()
-
-            if row:
-                return FlowConfig(
-                    name=row["name"],
-                    langflow_url=row["langflow_url"],
-                    flow_id=row["flow_id"],
-                    api_key=row["api_key"],
-                    description=row["description"],
-                    is_default=True,
-                )
-            return None
+        db = self._db
+        cursor = await db.execute(
+            "SELECT * FROM flows WHERE is_default = TRUE LIMIT 1"
+        )
+        row = await cursor.fetchone()
+
+        if row:
+            return FlowConfig.from_row(row)
+        return None
 
     async def set_default_flow(self, name: str) -> bool:
         """
@@ -309,22 +393,25 @@ class FlowManager:
         Returns:
             True if set, False if flow not found.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            # Check if flow exists
-            cursor = await db.execute(
-                "SELECT name FROM flows WHERE name = ?", (name,)
-            )
-            if not await cursor.fetchone():
-                return False
+        db = self._db
+        # Move the default flag in one statement; the EXISTS guard keeps the
+        # current default untouched when the target flow doesn't exist
+        cursor = await db.execute(
+            """
+            UPDATE flows
+            SET is_default = CASE WHEN name = ? THEN TRUE ELSE FALSE END
+            WHERE (is_default = TRUE OR name = ?)
+              AND EXISTS (SELECT 1 FROM flows WHERE name = ?)
+            """,
+            (name, name, name),
+        )
+        await db.commit()
+        if cursor.rowcount == 0:
+            return False
 
-            # Unset current default and set new one
-            await db.execute("UPDATE flows SET is_default = FALSE")
-            await db.execute(
-                "UPDATE flows SET is_default = TRUE WHERE name = ?", (name,)
-            )
-            await db.commit()
-            logger.info("Set default flow: %s", name)
-            return True
+        self._invalidate_flows()
+        logger.info("Set default flow: %s", name)
+        return True
 
     async def list_flows(self) -> list[FlowConfig]:
         """
@@ -333,22 +420,11 @@ class FlowManager:
         Returns:
             List of FlowConfig objects.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute("SELECT * FROM flows ORDER BY name")
-            rows = await cursor.fetchall()
-
-            return [
-                FlowConfig(
-                    name=row["name"],
-                    langflow_url=row["langflow_url"],
-                    flow_id=row["flow_id"],
-                    api_key=row["api_key"],
-                    description=row["description"],
-                    is_default=bool(row["is_default"]),
-                )
-                for row in rows
-            ]
+        db = self._db
+        cursor = await db.execute("SELECT * FROM flows ORDER BY name")
+        rows = await cursor.fetchall()
+
+        return [FlowConfig.from_row(row) for row in rows]
 
     async def set_channel_flow(self, channel_id: str, flow_name: str) -> bool:
         """
@@ -366,17 +442,18 @@ class FlowManager:
         if not flow:
             return False
 
-        async with aiosqlite.connect(self.database_path) as db:
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO channel_flows (channel_id, flow_name, created_at)
-                VALUES (?, ?, ?)
-                """,
-                (channel_id, flow_name, datetime.utcnow()),
-            )
-            await db.commit()
-            logger.info("Set channel %s to flow %s", channel_id, flow_name)
-            return True
+        db = self._db
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO channel_flows (channel_id, flow_name)
+            VALUES (?, ?)
+            """,
+            (channel_id, flow_name),
+        )
+        await db.commit()
+        self._channel_cache.pop(channel_id, None)
+        logger.info("Set channel %s to flow %s", channel_id, flow_name)
+        return True
 
     async def remove_channel_flow(self, channel_id: str) -> bool:
         """
@@ -388,12 +465,13 @@ class FlowManager:
         Returns:
             True if removed, False if not found.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            cursor = await db.execute(
-                "DELETE FROM channel_flows WHERE channel_id = ?", (channel_id,)
-            )
-            await db.commit()
-            return cursor.rowcount > 0
+        db = self._db
+        cursor = await db.execute(
+            "DELETE FROM channel_flows WHERE channel_id = ?", (channel_id,)
+        )
+        await db.commit()
+        self._channel_cache.pop(channel_id, None)
+        return cursor.rowcount > 0
 
     async def get_channel_flow(self, channel_id: str) -> Optional[FlowConfig]:
         """
@@ -407,19 +485,36 @@ class FlowManager:
         Returns:
             FlowConfig for the channel, or None if no flow configured.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            # Check for specific channel mapping
-            cursor = await db.execute(
-                "SELECT flow_name FROM channel_flows WHERE channel_id = ?",
-                (channel_id,),
+        cached = self._cache_get(self._channel_cache, channel_id)
+        if cached is not None:
+            return cached
+
+        db = self._db
+        # Channel mapping (priority 0) wins over the default flow (priority 1)
+        cursor = await db.execute(
+            """
+            SELECT * FROM (
+                SELECT 0 AS priority, f.*
+                FROM channel_flows c
+                JOIN flows f ON f.name = c.flow_name
+                WHERE c.channel_id = ?
+                UNION ALL
+                SELECT 1 AS priority, f.*
+                FROM flows f
+                WHERE f.is_default = TRUE
             )
-            row = await cursor.fetchone()
-
-            if row:
-                return await self.get_flow(row[0])
-
-        # Fall back to default flow
-        return await self.get_default_flow()
+            ORDER BY priority
+            LIMIT 1
+            """,
+            (channel_id,),
+        )
+        row = await cursor.fetchone()
+
+        if row:
+            flow = FlowConfig.from_row(row)
+            self._cache_put(self._channel_cache, channel_id, flow)
+            return flow
+        return None
 
     async def get_channel_flow_name(self, channel_id: str) -> Optional[str]:
         """
@@ -431,10 +526,10 @@ class FlowManager:
         Returns:
             Flow name if mapped, None otherwise (doesn't check default).
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            cursor = await db.execute(
-                "SELECT flow_name FROM channel_flows WHERE channel_id = ?",
-                (channel_id,),
-            )
-            row = await cursor.fetchone()
-            return row[0] if row else None
+        db = self._db
+        cursor = await db.execute(
+            "SELECT flow_name FROM channel_flows WHERE channel_id = ?",
+            (channel_id,),
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else None
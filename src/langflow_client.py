@@ -3,7 +3,8 @@ HTTP Client for the Langflow API.
 
 Handles communication with Langflow's run endpoint, including:
 - Long timeouts for agent processing
-- Retry logic with exponential backoff for 5xx errors
+- Retry logic with jittered exponential backoff for 429 and 5xx errors,
+  honoring Retry-After
 - Proper error handling and logging
 - Multi-flow support via LangflowClientManager
 """
@@ -12,9 +13,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, Optional, TYPE_CHECKING
 
 import httpx
+import orjson
 
 from .response_parser import extract_message
 
@@ -23,6 +28,37 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound (seconds) on any single wait between retries
+MAX_RETRY_WAIT = 30.0
+
+# Bytes of an error response body kept for logging and LangflowAPIError
+ERROR_BODY_LIMIT = 4096
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP-date.
+
+    Returns:
+        Seconds to wait, or None if missing or unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 
 class LangflowError(Exception):
     """Base exception for Langflow client errors."""
@@ -55,6 +91,7 @@ class LangflowClient:
         api_key: str,
         timeout: int = 300,
         max_retries: int = 2,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Initialize the Langflow client.
@@ -63,19 +100,34 @@ class LangflowClient:
             api_url: Base URL of the Langflow server.
             flow_id: ID of the flow to execute.
             api_key: API key for authentication.
-            timeout: Request timeout in seconds (default 300 = 5 minutes).
+            timeout: Request timeout in seconds (default 300 = 5 minutes),
+                applied per attempt to both socket operations and the request
+                as a whole.
             max_retries: Maximum number of retries for 5xx errors.
+            http_client: Shared HTTP client to send requests through. If not
+                provided, the client creates and owns its own.
         """
         self.api_url = api_url.rstrip("/")
         self.flow_id = flow_id
         self.api_key = api_key
         self.timeout = timeout
         self.max_retries = max_retries
-        self._client: Optional[httpx.AsyncClient] = None
+        self.endpoint = f"{self.api_url}/api/v1/run/{flow_id}"
+        # Auth is sent per request so the connection pool can be shared
+        self._headers = {
+            "Content-Type": "application/json",
+            "x-api-key": api_key,
+        }
+        self._client: Optional[httpx.AsyncClient] = http_client
+        self._owns_client = http_client is None
 
     @classmethod
     def from_flow_config(
-        cls, config: FlowConfig, timeout: int = 300, max_retries: int = 2
+        cls,
+        config: FlowConfig,
+        timeout: int = 300,
+        max_retries: int = 2,
+        http_client: Optional[httpx.AsyncClient] = None,
     ) -> LangflowClient:
         """
         Create a client from a FlowConfig object.
@@ -84,6 +136,7 @@ class LangflowClient:
             config: FlowConfig containing connection details.
             timeout: Request timeout in seconds.
             max_retries: Maximum number of retries.
+            http_client: Shared HTTP client (optional).
 
         Returns:
             Configured LangflowClient instance.
@@ -94,27 +147,22 @@ class LangflowClient:
             api_key=config.api_key,
             timeout=timeout,
             max_retries=max_retries,
+            http_client=http_client,
         )
 
-    @property
-    def endpoint(self) -> str:
-        """Returns the full run endpoint URL."""
-        return f"{self.api_url}/api/v1/run/{self.flow_id}"
-
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create the HTTP client."""
-        if self._client is None or self._client.is_closed:
+        """Get the shared HTTP client, or create an owned one."""
+        if self._owns_client and (self._client is None or self._client.is_closed):
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(self.timeout, connect=30.0),
-                headers={
-                    "Content-Type": "application/json",
-                    "x-api-key": self.api_key,
-                },
+                http2=True,
             )
         return self._client
 
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client if this instance owns it."""
+        if not self._owns_client:
+            return
         if self._client is not None and not self._client.is_closed:
             await self._client.aclose()
             self._client = None
@@ -143,51 +191,63 @@ class LangflowClient:
             "session_id": session_id,
         }
 
-        logger.info(
-            "Sending message to Langflow | session_id=%s | message_length=%d",
-            session_id,
-            len(message),
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Sending message to Langflow | session_id=%s | message_length=%d",
+                session_id,
+                len(message),
+            )
 
+        body = orjson.dumps(payload)
         client = await self._get_client()
         last_error: Optional[Exception] = None
 
         for attempt in range(self.max_retries + 1):
+            retry_after: Optional[float] = None
             try:
-                response = await client.post(self.endpoint, json=payload)
+                # httpx timeouts bound each read/write, not the whole request,
+                # so a slowly trickling response is capped here as well
+                response = await asyncio.wait_for(
+                    client.post(self.endpoint, content=body, headers=self._headers),
+                    timeout=self.timeout,
+                )
 
                 if response.status_code == 200:
-                    data = response.json()
-                    logger.info(
-                        "Received response from Langflow | session_id=%s",
-                        session_id,
-                    )
+                    data = orjson.loads(response.content)
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "Received response from Langflow | session_id=%s",
+                            session_id,
+                        )
                     return data
 
-                # Handle error responses
-                error_body = response.text
+                # Handle error responses (decode only a bounded prefix)
+                error_body = response.content[:ERROR_BODY_LIMIT].decode(
+                    "utf-8", errors="replace"
+                )
                 logger.error(
                     "Langflow error | status=%d | body=%s",
                     response.status_code,
                     error_body[:500],
                 )
 
-                # Don't retry 4xx errors (client errors)
-                if 400 <= response.status_code < 500:
+                # Don't retry 4xx errors (client errors), except rate limiting
+                if 400 <= response.status_code < 500 and response.status_code != 429:
                     raise LangflowAPIError(
                         f"Langflow returned {response.status_code}",
                         response.status_code,
                         error_body,
                     )
 
-                # Retry 5xx errors (server errors)
+                # Retry 429 and 5xx errors (server errors)
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
                 last_error = LangflowAPIError(
                     f"Langflow returned {response.status_code}",
                     response.status_code,
                     error_body,
                 )
 
-            except httpx.TimeoutException as e:
+            except (httpx.TimeoutException, asyncio.TimeoutError):
                 logger.warning(
                     "Langflow timeout | attempt=%d/%d | session_id=%s",
                     attempt + 1,
@@ -207,10 +267,13 @@ class LangflowClient:
                 )
                 last_error = LangflowError(f"Request failed: {e}")
 
-            # Exponential backoff before retry
+            # Exponential backoff with jitter, unless the server said when
             if attempt < self.max_retries:
-                wait_time = 2 ** attempt
-                logger.info("Retrying in %d seconds...", wait_time)
+                if retry_after is not None:
+                    wait_time = min(MAX_RETRY_WAIT, retry_after)
+                else:
+                    wait_time = min(MAX_RETRY_WAIT, 2 ** attempt + random.uniform(0, 1))
+                logger.info("Retrying in %.1f seconds...", wait_time)
                 await asyncio.sleep(wait_time)
 
         # All retries exhausted
@@ -242,7 +305,9 @@ class LangflowClientManager:
     """
     Manages multiple Langflow clients for different flows.
 
-    Caches clients to avoid creating new connections for each request.
+    Caches clients per flow and routes them all through one shared
+    httpx.AsyncClient, so flows hosted on the same Langflow server reuse
+    pooled connections.
     """
 
     def __init__(self, timeout: int = 300, max_retries: int = 2):
@@ -256,6 +321,17 @@ class LangflowClientManager:
         self.timeout = timeout
         self.max_retries = max_retries
         self._clients: dict[str, LangflowClient] = {}
+        # HTTP/2 multiplexes concurrent runs against the same Langflow host
+        # over one connection (falls back to HTTP/1.1 if the server lacks it)
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=30.0),
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=120,
+            ),
+        )
 
     def get_client(self, config: FlowConfig) -> LangflowClient:
         """
@@ -270,26 +346,26 @@ class LangflowClientManager:
         # Use flow name as cache key
         if config.name not in self._clients:
             self._clients[config.name] = LangflowClient.from_flow_config(
-                config, self.timeout, self.max_retries
+                config, self.timeout, self.max_retries, http_client=self._http
             )
             logger.debug("Created new client for flow: %s", config.name)
         return self._clients[config.name]
 
-    def invalidate(self, flow_name: str) -> None:
+    async def invalidate(self, flow_name: str) -> None:
         """
         Invalidate a cached client (e.g., after flow config update).
 
         Args:
             flow_name: Name of the flow to invalidate.
         """
-        if flow_name in self._clients:
-            # Don't await close here - let it be garbage collected
-            del self._clients[flow_name]
+        client = self._clients.pop(flow_name, None)
+        if client is not None:
+            # Close eagerly so an owned connection pool isn't leaked
+            await client.close()
             logger.debug("Invalidated client cache for flow: %s", flow_name)
 
     async def close_all(self) -> None:
-        """Close all cached clients."""
-        for name, client in self._clients.items():
-            await client.close()
-            logger.debug("Closed client for flow: %s", name)
+        """Drop all cached clients and close the shared HTTP client."""
         self._clients.clear()
+        await self._http.aclose()
+        logger.debug("Closed shared Langflow HTTP client")
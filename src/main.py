@@ -28,32 +28,69 @@ logger = logging.getLogger(__name__)
 _handler: Optional[SlackHandler] = None
 _session_manager: Optional[SessionManager] = None
 _flow_manager: Optional[FlowManager] = None
+_cleanup_handle: Optional[asyncio.TimerHandle] = None
 _cleanup_task: Optional[asyncio.Task] = None
+# Set by the signal handler to request a graceful shutdown
+_stop_event: Optional[asyncio.Event] = None
+# Guards against concurrent teardown (e.g. a second signal)
+_shutting_down = False
+
+
+def schedule_cleanup(
+    session_manager: SessionManager, interval_hours: int, ttl_hours: int
+) -> None:
+    """
+    Schedule the next periodic session cleanup on the event loop.
+
+    Uses a timer rather than a long-sleeping task; each run reschedules
+    the next one.
+
+    Args:
+        session_manager: Session manager instance.
+        interval_hours: How often to run cleanup (in hours).
+        ttl_hours: Delete sessions older than this (in hours).
+    """
+    global _cleanup_handle
+    loop = asyncio.get_running_loop()
+    _cleanup_handle = loop.call_later(
+        interval_hours * 3600,
+        _start_cleanup,
+        session_manager,
+        interval_hours,
+        ttl_hours,
+    )
+
+
+def _start_cleanup(
+    session_manager: SessionManager, interval_hours: int, ttl_hours: int
+) -> None:
+    """Timer callback that launches a cleanup run."""
+    global _cleanup_task
+    _cleanup_task = asyncio.create_task(
+        periodic_cleanup(session_manager, interval_hours, ttl_hours)
+    )
 
 
 async def periodic_cleanup(
     session_manager: SessionManager, interval_hours: int, ttl_hours: int
 ) -> None:
     """
-    Periodically cleanup old sessions.
+    Cleanup old sessions once, then schedule the next run.
 
     Args:
         session_manager: Session manager instance.
         interval_hours: How often to run cleanup (in hours).
         ttl_hours: Delete sessions older than this (in hours).
     """
-    interval_seconds = interval_hours * 3600
+    try:
+        count = await session_manager.cleanup_old_sessions(ttl_hours)
+        if count > 0:
+            logger.info("Periodic cleanup: removed %d old sessions", count)
+    except Exception as e:
+        logger.error("Error during periodic cleanup: %s", e)
 
-    while True:
-        try:
-            await asyncio.sleep(interval_seconds)
-            count = await session_manager.cleanup_old_sessions(ttl_hours)
-            if count > 0:
-                logger.info("Periodic cleanup: removed %d old sessions", count)
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            logger.error("Error during periodic cleanup: %s", e)
+    if not _shutting_down:
+        schedule_cleanup(session_manager, interval_hours, ttl_hours)
 
 
 async def setup_default_flow(settings, flow_manager: FlowManager) -> None:
@@ -90,7 +127,7 @@ async def setup_default_flow(settings, flow_manager: FlowManager) -> None:
 
 async def main() -> None:
     """Main entry point for the bot."""
-    global _handler, _session_manager, _flow_manager, _cleanup_task
+    global _handler, _session_manager, _flow_manager, _stop_event
 
     # Load settings
     try:
@@ -131,13 +168,11 @@ async def main() -> None:
         client_manager=client_manager,
     )
 
-    # Start periodic cleanup task
-    _cleanup_task = asyncio.create_task(
-        periodic_cleanup(
-            _session_manager,
-            interval_hours=1,  # Run cleanup every hour
-            ttl_hours=settings.session_ttl_hours,
-        )
+    # Schedule periodic cleanup
+    schedule_cleanup(
+        _session_manager,
+        interval_hours=1,  # Run cleanup every hour
+        ttl_hours=settings.session_ttl_hours,
     )
 
     # Log configuration (without sensitive values)
@@ -161,59 +196,110 @@ async def main() -> None:
     stats = await _session_manager.get_session_stats()
     logger.info("Session stats: %s", stats)
 
+    # Handle signals for graceful shutdown
+    _stop_event = asyncio.Event()
+    if sys.platform != "win32":
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, handle_signal, sig)
+
+    # Run the Slack handler until it exits or a shutdown is requested
+    handler_task = asyncio.create_task(_handler.start())
+    stop_task = asyncio.create_task(_stop_event.wait())
     try:
-        # Start the Slack handler (blocks until shutdown)
-        await _handler.start()
+        done, _ = await asyncio.wait(
+            {handler_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if handler_task in done:
+            handler_task.result()
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
         logger.exception("Fatal error: %s", e)
         raise
     finally:
+        for task in (handler_task, stop_task):
+            task.cancel()
+        await asyncio.gather(handler_task, stop_task, return_exceptions=True)
         await shutdown()
 
 
+async def _close_resources() -> None:
+    """Close the Slack handler and database connections."""
+    # Close each resource independently so one failure doesn't leak the rest
+    closers = [
+        ("Slack handler", _handler and _handler.cleanup),
+        ("session database", _session_manager and _session_manager.close),
+        ("flow database", _flow_manager and _flow_manager.close),
+    ]
+    for name, close in closers:
+        if not close:
+            continue
+        try:
+            await close()
+        except Exception as e:
+            logger.error("Error closing %s: %s", name, e)
+
+
 async def shutdown() -> None:
     """Gracefully shutdown the bot."""
-    global _handler, _cleanup_task
+    global _shutting_down
+
+    if _shutting_down:
+        return
+    _shutting_down = True
 
     logger.info("Shutting down...")
 
-    # Cancel cleanup task
-    if _cleanup_task:
+    # Cancel the pending cleanup timer and any run in progress
+    if _cleanup_handle:
+        _cleanup_handle.cancel()
+    if _cleanup_task and not _cleanup_task.done():
         _cleanup_task.cancel()
         try:
             await _cleanup_task
         except asyncio.CancelledError:
             pass
 
-    # Cleanup handler resources
-    if _handler:
-        await _handler.cleanup()
+    # Shield resource cleanup so a cancellation can't interrupt it halfway;
+    # if we are cancelled, finish cleanup before propagating
+    close_task = asyncio.ensure_future(_close_resources())
+    try:
+        await asyncio.shield(close_task)
+    except asyncio.CancelledError:
+        logger.warning("Shutdown cancelled, finishing cleanup first")
+        await close_task
+        raise
 
     logger.info("Shutdown complete")
 
 
 def handle_signal(sig: signal.Signals) -> None:
-    """Handle shutdown signals."""
+    """Handle shutdown signals by waking main() to shut down."""
     logger.info("Received signal %s", sig.name)
-    # Get the running loop and schedule shutdown
-    loop = asyncio.get_running_loop()
-    loop.create_task(shutdown())
-    loop.stop()
+    if _stop_event is not None:
+        _stop_event.set()
 
 
-def run() -> None:
-    """Entry point for running the bot."""
-    # Handle signals for graceful shutdown
-    if sys.platform != "win32":
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        for sig in (signal.SIGTERM, signal.SIGINT):
-            loop.add_signal_handler(sig, lambda s=sig: handle_signal(s))
+def run_event_loop() -> None:
+    """
+    Run main() to completion on uvloop when it is installed.
 
+    Falls back to the stdlib event loop where uvloop is unavailable
+    (e.g. Windows).
+    """
     try:
+        import uvloop
+    except ImportError:
         asyncio.run(main())
+        return
+    uvloop.run(main())
+
+
+def run() -> None:
+    """Entry point for running the bot."""
+    try:
+        run_event_loop()
     except KeyboardInterrupt:
         pass
 
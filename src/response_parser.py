@@ -22,10 +22,30 @@ Response structure varies but typically looks like:
 """
 
 import logging
-from typing import Any, Optional
+import re
+from typing import Any, Iterator
 
 logger = logging.getLogger(__name__)
 
+# Whitespace skipped at the start of each chunk after a split
+_LEADING_WHITESPACE = re.compile(r"\s*")
+
+
+# Candidate locations of the agent message inside outputs[0].outputs[0],
+# in priority order, as (description, key path) pairs
+_MESSAGE_PATHS: tuple[tuple[str, tuple[Any, ...]], ...] = (
+    # Path 1: artifacts.message (most common for agents)
+    ("artifacts.message", ("artifacts", "message")),
+    # Path 2: messages array
+    ("messages array", ("messages", 0, "message")),
+    # Path 3: results.message.text
+    ("results.message.text", ("results", "message", "text")),
+    # Path 4: results.message.data.text
+    ("results.message.data.text", ("results", "message", "data", "text")),
+    # Path 5: results.message as direct string
+    ("results.message (string)", ("results", "message")),
+)
+
 
 def extract_message(response: dict[str, Any]) -> str:
     """
@@ -48,153 +68,79 @@ def extract_message(response: dict[str, Any]) -> str:
         Extracted message text, or empty string if not found.
     """
     try:
-        outputs = response.get("outputs", [])
-        if not outputs:
-            logger.warning("No 'outputs' array in response")
-            return ""
-
-        inner_outputs = outputs[0].get("outputs", [])
-        if not inner_outputs:
-            logger.warning("No inner 'outputs' array in response")
-            return ""
-
-        result = inner_outputs[0]
-
-        # Path 1: artifacts.message (most common for agents)
-        message = _try_artifacts_message(result)
-        if message:
-            logger.debug("Extracted message from artifacts.message")
-            return message
-
-        # Path 2: messages array
-        message = _try_messages_array(result)
-        if message:
-            logger.debug("Extracted message from messages array")
-            return message
-
-        # Path 3: results.message.text
-        message = _try_results_message_text(result)
-        if message:
-            logger.debug("Extracted message from results.message.text")
-            return message
-
-        # Path 4: results.message.data.text
-        message = _try_results_message_data_text(result)
-        if message:
-            logger.debug("Extracted message from results.message.data.text")
-            return message
-
-        # Path 5: results.message as direct string
-        message = _try_results_message_string(result)
-        if message:
-            logger.debug("Extracted message from results.message (string)")
-            return message
-
-        logger.warning(
-            "Could not extract message from response. Keys in result: %s",
-            list(result.keys()) if isinstance(result, dict) else "not a dict",
-        )
+        result = response["outputs"][0]["outputs"][0]
+    except (KeyError, IndexError, TypeError):
+        logger.warning("No 'outputs' in response")
         return ""
 
-    except Exception as e:
-        logger.error("Error parsing Langflow response: %s", e, exc_info=True)
+    if not isinstance(result, dict):
+        logger.warning("Could not extract message from response: result is not a dict")
         return ""
 
+    for description, path in _MESSAGE_PATHS:
+        value: Any = result
+        try:
+            for key in path:
+                value = value[key]
+        except (KeyError, IndexError, TypeError):
+            continue
 
-def _try_artifacts_message(result: dict[str, Any]) -> Optional[str]:
-    """Try to extract message from artifacts.message."""
-    if "artifacts" not in result:
-        return None
-
-    artifacts = result["artifacts"]
-    if not isinstance(artifacts, dict):
-        return None
-
-    message = artifacts.get("message")
-    if isinstance(message, str) and message.strip():
-        return message.strip()
-
-    return None
-
-
-def _try_messages_array(result: dict[str, Any]) -> Optional[str]:
-    """Try to extract message from messages array."""
-    if "messages" not in result:
-        return None
-
-    messages = result["messages"]
-    if not isinstance(messages, list) or not messages:
-        return None
-
-    first_message = messages[0]
-    if not isinstance(first_message, dict):
-        return None
-
-    message = first_message.get("message")
-    if isinstance(message, str) and message.strip():
-        return message.strip()
+        if isinstance(value, str) and value.strip():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Extracted message from %s", description)
+            return value.strip()
 
-    return None
+    logger.warning(
+        "Could not extract message from response. Keys in result: %s",
+        list(result.keys()),
+    )
+    return ""
 
 
-def _try_results_message_text(result: dict[str, Any]) -> Optional[str]:
-    """Try to extract message from results.message.text."""
-    if "results" not in result:
-        return None
-
-    results = result["results"]
-    if not isinstance(results, dict):
-        return None
-
-    message_obj = results.get("message")
-    if not isinstance(message_obj, dict):
-        return None
-
-    text = message_obj.get("text")
-    if isinstance(text, str) and text.strip():
-        return text.strip()
-
-    return None
-
-
-def _try_results_message_data_text(result: dict[str, Any]) -> Optional[str]:
-    """Try to extract message from results.message.data.text."""
-    if "results" not in result:
-        return None
+def iter_slack_chunks(message: str, max_length: int = 3900) -> Iterator[str]:
+    """
+    Lazily split a message into Slack-sized chunks.
 
-    results = result["results"]
-    if not isinstance(results, dict):
-        return None
+    Slack has a 4000 character limit per message. Chunks are produced
+    one at a time, preferring to split at paragraph boundaries, so a
+    caller that posts them sequentially never holds them all at once.
 
-    message_obj = results.get("message")
-    if not isinstance(message_obj, dict):
-        return None
+    Args:
+        message: The message to split.
+        max_length: Maximum length per chunk (default 3900 for margin).
 
-    data = message_obj.get("data")
-    if not isinstance(data, dict):
-        return None
+    Yields:
+        Message chunks, in order.
+    """
+    # Advance an offset through the original string instead of re-slicing
+    # the remainder on every split, keeping the total work linear
+    start = 0
+    end = len(message)
 
-    text = data.get("text")
-    if isinstance(text, str) and text.strip():
-        return text.strip()
+    while start < end:
+        if end - start <= max_length:
+            yield message[start:]
+            return
 
-    return None
+        limit = start + max_length
 
+        # Try to split at paragraph boundary
+        split_point = message.rfind("\n\n", start, limit)
 
-def _try_results_message_string(result: dict[str, Any]) -> Optional[str]:
-    """Try to extract message from results.message as direct string."""
-    if "results" not in result:
-        return None
+        # If no paragraph boundary, try newline
+        if split_point == -1:
+            split_point = message.rfind("\n", start, limit)
 
-    results = result["results"]
-    if not isinstance(results, dict):
-        return None
+        # If no newline, try space
+        if split_point == -1:
+            split_point = message.rfind(" ", start, limit)
 
-    message = results.get("message")
-    if isinstance(message, str) and message.strip():
-        return message.strip()
+        # Last resort: hard split
+        if split_point == -1:
+            split_point = limit
 
-    return None
+        yield message[start:split_point].rstrip()
+        start = _LEADING_WHITESPACE.match(message, split_point).end()
 
 
 def format_for_slack(message: str, max_length: int = 3900) -> list[str]:
@@ -218,31 +164,6 @@ def format_for_slack(message: str, max_length: int = 3900) -> list[str]:
     if len(message) <= max_length:
         return [message]
 
-    chunks = []
-    remaining = message
-
-    while remaining:
-        if len(remaining) <= max_length:
-            chunks.append(remaining)
-            break
-
-        # Try to split at paragraph boundary
-        split_point = remaining.rfind("\n\n", 0, max_length)
-
-        # If no paragraph boundary, try newline
-        if split_point == -1:
-            split_point = remaining.rfind("\n", 0, max_length)
-
-        # If no newline, try space
-        if split_point == -1:
-            split_point = remaining.rfind(" ", 0, max_length)
-
-        # Last resort: hard split
-        if split_point == -1:
-            split_point = max_length
-
-        chunks.append(remaining[:split_point].rstrip())
-        remaining = remaining[split_point:].lstrip()
-
+    chunks = list(iter_slack_chunks(message, max_length))
     logger.info("Split message into %d chunks", len(chunks))
     return chunks
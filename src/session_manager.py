@@ -6,25 +6,78 @@ and Langflow session IDs, enabling conversation continuity.
 
 Database Schema:
     CREATE TABLE sessions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        thread_key TEXT UNIQUE NOT NULL,  -- format: "{channel_id}:{thread_ts}"
-        session_id TEXT NOT NULL,          -- UUID for Langflow
-        flow_name TEXT,                    -- Which flow this session uses
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
+        thread_key TEXT PRIMARY KEY NOT NULL,  -- format: "{channel_id}:{thread_ts}"
+        session_id TEXT NOT NULL,              -- UUID for Langflow
+        flow_name TEXT,                        -- Which flow this session uses
+        created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        updated_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    ) WITHOUT ROWID;                           -- timestamps are unix epoch seconds
 """
 
+import asyncio
 import logging
-import uuid
+import os
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from typing import Optional
 
 import aiosqlite
 
 logger = logging.getLogger(__name__)
 
+# Maximum threads kept in SessionManager's in-process session cache
+_CACHE_MAXSIZE = 4096
+
+# Maximum threads remembered as having no session (negative lookups)
+_MISSING_MAXSIZE = 4096
+
+# Sessions schema version, stored in the database's PRAGMA user_version
+# (the flows tables don't use it); bump when the sessions layout changes
+_SCHEMA_VERSION = 2
+
+# Sessions are only ever looked up by thread_key, so the table is clustered
+# on it (WITHOUT ROWID): every read or update is a single B-tree descent.
+# Timestamps are integer unix epoch seconds, keeping idx_updated_at keys
+# small and range comparisons numeric.
+_CREATE_SESSIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        thread_key TEXT PRIMARY KEY NOT NULL,
+        session_id TEXT NOT NULL,
+        flow_name TEXT,
+        created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        updated_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    ) WITHOUT ROWID
+"""
+
+# Seconds between batched writes of pending updated_at refreshes
+_TOUCH_FLUSH_INTERVAL = 2.0
+
+
+def _new_session_id() -> str:
+    """
+    Generate a random session ID.
+
+    Builds an RFC 4122 version-4 UUID string directly from os.urandom,
+    skipping the uuid.UUID object round-trip.
+
+    Returns:
+        A 36-character UUID string.
+    """
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _epoch_to_iso(value: Optional[int]) -> Optional[str]:
+    """Convert a stored epoch-seconds timestamp to an ISO 8601 UTC string."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+
 
 @dataclass
 class SessionInfo:
@@ -46,47 +99,123 @@ class SessionManager:
         """
         self.database_path = database_path
         self._initialized = False
+        # Long-lived connection, opened in initialize() and closed in close()
+        self._db: Optional[aiosqlite.Connection] = None
+        # LRU cache of thread_key -> (session_id, flow_name); both are
+        # immutable for a session, so only updated_at needs the database
+        self._cache: OrderedDict[str, tuple[str, Optional[str]]] = OrderedDict()
+        # LRU set of thread_keys known to have no session, so has_session
+        # doesn't query for every reply in threads the bot isn't part of
+        self._missing: OrderedDict[str, None] = OrderedDict()
+        # Threads whose updated_at refresh is waiting for the next flush
+        self._dirty: set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Set by close() to stop the flush loop between flushes
+        self._closing = asyncio.Event()
+        # Serializes write transactions on the shared connection, so a failed
+        # write's rollback can't discard another coroutine's uncommitted work
+        self._write_lock = asyncio.Lock()
 
     async def initialize(self) -> None:
-        """Initialize the database and create tables if they don't exist."""
+        """Open the database connection and create tables if they don't exist."""
         if self._initialized:
             return
 
-        async with aiosqlite.connect(self.database_path) as db:
-            # Check if we need to migrate (add flow_name column)
-            cursor = await db.execute("PRAGMA table_info(sessions)")
-            columns = [row[1] for row in await cursor.fetchall()]
-
-            if "sessions" not in columns:
-                # Table doesn't exist, create it with flow_name
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS sessions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        thread_key TEXT UNIQUE NOT NULL,
-                        session_id TEXT NOT NULL,
-                        flow_name TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-            elif "flow_name" not in columns:
-                # Table exists but missing flow_name, add it
-                await db.execute(
-                    "ALTER TABLE sessions ADD COLUMN flow_name TEXT"
-                )
-                logger.info("Migrated sessions table: added flow_name column")
+        self._db = await aiosqlite.connect(self.database_path)
+        self._db.row_factory = aiosqlite.Row
 
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_thread_key ON sessions(thread_key)"
-            )
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_updated_at ON sessions(updated_at)"
-            )
-            await db.commit()
+        db = self._db
+        # WAL lets readers proceed during writes; NORMAL drops per-commit fsyncs
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA temp_store=MEMORY")
+        await db.execute("PRAGMA mmap_size=268435456")
+        await db.execute("PRAGMA cache_size=-20000")
+        await db.execute("PRAGMA busy_timeout=5000")
+
+        # Only inspect and migrate the schema if it predates the current one
+        cursor = await db.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        if row[0] < _SCHEMA_VERSION:
+            await self._migrate()
+
+        self._closing.clear()
+        self._flush_task = asyncio.create_task(self._flush_loop())
 
         self._initialized = True
         logger.info("Session database initialized at %s", self.database_path)
 
+    async def _migrate(self) -> None:
+        """Create or upgrade the sessions table and record the schema version."""
+        db = self._db
+
+        # Check if we need to migrate (legacy rowid table, TEXT timestamps,
+        # missing flow_name); maps column name -> declared type
+        cursor = await db.execute("PRAGMA table_info(sessions)")
+        columns = {row[1]: row[2] for row in await cursor.fetchall()}
+
+        if not columns:
+            # Table doesn't exist, create it
+            await db.execute(_CREATE_SESSIONS_TABLE.format(table="sessions"))
+        elif "id" in columns or columns.get("updated_at") != "INTEGER":
+            await self._rebuild_sessions_table(columns)
+
+        # Entries of a WITHOUT ROWID index carry the primary key, so this is
+        # effectively (updated_at, thread_key): cleanup's range scan and its
+        # RETURNING thread_key are answered from the index alone
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_updated_at ON sessions(updated_at)"
+        )
+        await db.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        await db.commit()
+
+    async def _rebuild_sessions_table(self, columns: dict[str, str]) -> None:
+        """
+        Rebuild a legacy sessions table in the current layout.
+
+        Copies rows into a WITHOUT ROWID table keyed on thread_key,
+        converting TIMESTAMP text to unix epoch seconds.
+
+        Args:
+            columns: Column names of the existing table mapped to their types.
+        """
+        db = self._db
+        # Very old tables predate the flow_name column
+        flow_name = "flow_name" if "flow_name" in columns else "NULL"
+
+        await db.execute("DROP TABLE IF EXISTS sessions_new")
+        await db.execute(_CREATE_SESSIONS_TABLE.format(table="sessions_new"))
+        await db.execute(
+            f"""
+            INSERT INTO sessions_new
+                (thread_key, session_id, flow_name, created_at, updated_at)
+            SELECT thread_key, session_id, {flow_name},
+                CAST(strftime('%s', created_at) AS INTEGER),
+                CAST(strftime('%s', updated_at) AS INTEGER)
+            FROM sessions
+            """
+        )
+        # Dropping the table also drops its indexes (idx_thread_key included)
+        await db.execute("DROP TABLE sessions")
+        await db.execute("ALTER TABLE sessions_new RENAME TO sessions")
+        logger.info("Migrated sessions table to the current schema")
+
+    async def close(self) -> None:
+        """Flush pending timestamp refreshes and close the database connection."""
+        if self._flush_task is not None:
+            # Let an in-flight flush finish rather than cancelling it mid-write
+            self._closing.set()
+            await self._flush_task
+            self._flush_task = None
+
+        if self._db is not None:
+            try:
+                await self._flush_touches()
+            finally:
+                await self._db.close()
+                self._db = None
+                self._initialized = False
+
     def _make_thread_key(self, channel_id: str, thread_ts: str) -> str:
         """
         Create a unique thread key from channel and thread timestamp.
@@ -98,7 +227,66 @@ class SessionManager:
         Returns:
             A unique key in format "channel_id:thread_ts".
         """
-        return f"{channel_id}:{thread_ts}"
+        return channel_id + ":" + thread_ts
+
+    def _cache_get(self, thread_key: str) -> Optional[tuple[str, Optional[str]]]:
+        """Look up a cached session, marking it as most recently used."""
+        entry = self._cache.get(thread_key)
+        if entry is not None:
+            self._cache.move_to_end(thread_key)
+        return entry
+
+    def _cache_put(
+        self, thread_key: str, session_id: str, flow_name: Optional[str]
+    ) -> None:
+        """Cache a session, evicting the least recently used if full."""
+        # The thread now has a session, so it is no longer a known miss
+        self._missing.pop(thread_key, None)
+        self._cache[thread_key] = (session_id, flow_name)
+        self._cache.move_to_end(thread_key)
+        if len(self._cache) > _CACHE_MAXSIZE:
+            self._cache.popitem(last=False)
+
+    def _touch(self, thread_key: str) -> None:
+        """Queue a refresh of a session's updated_at for the next flush."""
+        self._dirty.add(thread_key)
+
+    async def _flush_touches(self) -> None:
+        """Write all queued updated_at refreshes in a single transaction."""
+        if not self._dirty:
+            return
+
+        async with self._write_lock:
+            now = int(time.time())
+            pending = self._dirty
+            self._dirty = set()
+            try:
+                await self._db.executemany(
+                    "UPDATE sessions SET updated_at = ? WHERE thread_key = ?",
+                    [(now, thread_key) for thread_key in pending],
+                )
+                await self._db.commit()
+            except BaseException:
+                # Requeue the refreshes so active sessions aren't later cleaned
+                # up as expired; they are retried on the next flush
+                self._dirty |= pending
+                await self._db.rollback()
+                raise
+
+    async def _flush_loop(self) -> None:
+        """Periodically flush queued updated_at refreshes."""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._closing.wait(), timeout=_TOUCH_FLUSH_INTERVAL
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self._flush_touches()
+            except Exception as e:
+                logger.error("Error flushing session timestamps: %s", e)
 
     async def get_session(
         self, channel_id: str, thread_ts: str
@@ -115,37 +303,78 @@ class SessionManager:
         """
         thread_key = self._make_thread_key(channel_id, thread_ts)
 
-        async with aiosqlite.connect(self.database_path) as db:
-            db.row_factory = aiosqlite.Row
+        cached = self._cache_get(thread_key)
+        if cached is not None:
+            self._touch(thread_key)
+            return SessionInfo(session_id=cached[0], flow_name=cached[1])
+
+        db = self._db
+        # Touch updated_at and read the session back in a single statement
+        async with self._write_lock:
             cursor = await db.execute(
-                "SELECT session_id, flow_name FROM sessions WHERE thread_key = ?",
-                (thread_key,),
+                """
+                UPDATE sessions SET updated_at = ? WHERE thread_key = ?
+                RETURNING session_id, flow_name
+                """,
+                (int(time.time()), thread_key),
             )
             row = await cursor.fetchone()
+            await db.commit()
 
-            if row:
-                # Update the updated_at timestamp
-                await db.execute(
-                    "UPDATE sessions SET updated_at = ? WHERE thread_key = ?",
-                    (datetime.utcnow(), thread_key),
-                )
-                await db.commit()
-
-                session_info = SessionInfo(
-                    session_id=row["session_id"],
-                    flow_name=row["flow_name"],
-                    is_new=False,
-                )
-                logger.debug(
-                    "Found existing session %s (flow=%s) for thread %s",
-                    session_info.session_id,
-                    session_info.flow_name,
-                    thread_key,
-                )
-                return session_info
+        if row:
+            session_info = SessionInfo(
+                session_id=row["session_id"],
+                flow_name=row["flow_name"],
+                is_new=False,
+            )
+            self._cache_put(thread_key, session_info.session_id, session_info.flow_name)
+            logger.debug(
+                "Found existing session %s (flow=%s) for thread %s",
+                session_info.session_id,
+                session_info.flow_name,
+                thread_key,
+            )
+            return session_info
 
         return None
 
+    async def has_session(self, channel_id: str, thread_ts: str) -> bool:
+        """
+        Check whether a thread has a session, without touching it.
+
+        A session exists for every thread the bot has answered in, so this
+        also tells whether the bot participates in the thread.
+
+        Args:
+            channel_id: Slack channel ID.
+            thread_ts: Slack thread timestamp.
+
+        Returns:
+            True if the thread has a session, False otherwise.
+        """
+        thread_key = self._make_thread_key(channel_id, thread_ts)
+
+        if self._cache_get(thread_key) is not None:
+            return True
+        if thread_key in self._missing:
+            self._missing.move_to_end(thread_key)
+            return False
+
+        cursor = await self._db.execute(
+            "SELECT session_id, flow_name FROM sessions WHERE thread_key = ?",
+            (thread_key,),
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            self._missing[thread_key] = None
+            if len(self._missing) > _MISSING_MAXSIZE:
+                self._missing.popitem(last=False)
+            return False
+
+        # The session is likely to be fetched next; keep it cached
+        self._cache_put(thread_key, row["session_id"], row["flow_name"])
+        return True
+
     async def create_session(
         self, channel_id: str, thread_ts: str, flow_name: Optional[str] = None
     ) -> SessionInfo:
@@ -161,17 +390,19 @@ class SessionManager:
             Newly created SessionInfo.
         """
         thread_key = self._make_thread_key(channel_id, thread_ts)
-        session_id = str(uuid.uuid4())
+        session_id = _new_session_id()
 
-        async with aiosqlite.connect(self.database_path) as db:
+        db = self._db
+        async with self._write_lock:
             await db.execute(
                 """
-                INSERT INTO sessions (thread_key, session_id, flow_name, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO sessions (thread_key, session_id, flow_name)
+                VALUES (?, ?, ?)
                 """,
-                (thread_key, session_id, flow_name, datetime.utcnow(), datetime.utcnow()),
+                (thread_key, session_id, flow_name),
             )
             await db.commit()
+        self._cache_put(thread_key, session_id, flow_name)
 
         logger.info(
             "Created new session %s (flow=%s) for thread %s",
@@ -202,10 +433,52 @@ class SessionManager:
         Returns:
             SessionInfo (existing or newly created).
         """
-        session_info = await self.get_session(channel_id, thread_ts)
-        if session_info:
-            return session_info
-        return await self.create_session(channel_id, thread_ts, flow_name)
+        thread_key = self._make_thread_key(channel_id, thread_ts)
+
+        cached = self._cache_get(thread_key)
+        if cached is not None:
+            self._touch(thread_key)
+            return SessionInfo(session_id=cached[0], flow_name=cached[1])
+
+        new_session_id = _new_session_id()
+
+        # Insert or touch atomically; the returned row is the canonical session,
+        # so concurrent first messages in a thread can't create two sessions
+        db = self._db
+        async with self._write_lock:
+            cursor = await db.execute(
+                """
+                INSERT INTO sessions (thread_key, session_id, flow_name)
+                VALUES (?, ?, ?)
+                ON CONFLICT(thread_key) DO UPDATE SET updated_at = excluded.updated_at
+                RETURNING session_id, flow_name
+                """,
+                (thread_key, new_session_id, flow_name),
+            )
+            row = await cursor.fetchone()
+            await db.commit()
+
+        session_info = SessionInfo(
+            session_id=row["session_id"],
+            flow_name=row["flow_name"],
+            is_new=row["session_id"] == new_session_id,
+        )
+        self._cache_put(thread_key, session_info.session_id, session_info.flow_name)
+        if session_info.is_new:
+            logger.info(
+                "Created new session %s (flow=%s) for thread %s",
+                session_info.session_id,
+                session_info.flow_name,
+                thread_key,
+            )
+        else:
+            logger.debug(
+                "Found existing session %s (flow=%s) for thread %s",
+                session_info.session_id,
+                session_info.flow_name,
+                thread_key,
+            )
+        return session_info
 
     async def cleanup_old_sessions(self, hours: int) -> int:
         """
@@ -217,22 +490,26 @@ class SessionManager:
         Returns:
             Number of sessions deleted.
         """
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        # Persist pending refreshes first so active sessions aren't deleted
+        await self._flush_touches()
 
-        async with aiosqlite.connect(self.database_path) as db:
+        db = self._db
+        cutoff = int(time.time()) - hours * 3600
+        async with self._write_lock:
             cursor = await db.execute(
-                "SELECT COUNT(*) FROM sessions WHERE updated_at < ?",
+                "DELETE FROM sessions WHERE updated_at < ? RETURNING thread_key",
                 (cutoff,),
             )
-            row = await cursor.fetchone()
-            count = row[0] if row else 0
+            deleted = await cursor.fetchall()
+            await db.commit()
 
-            if count > 0:
-                await db.execute(
-                    "DELETE FROM sessions WHERE updated_at < ?", (cutoff,)
-                )
-                await db.commit()
-                logger.info("Cleaned up %d old sessions", count)
+        # Evict deleted sessions so a later message starts a fresh one
+        for row in deleted:
+            self._cache.pop(row[0], None)
+        count = len(deleted)
+
+        if count > 0:
+            logger.info("Cleaned up %d old sessions", count)
 
         return count
 
@@ -243,43 +520,40 @@ class SessionManager:
         Returns:
             Dictionary with session statistics.
         """
-        async with aiosqlite.connect(self.database_path) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM sessions")
-            total_row = await cursor.fetchone()
-            total = total_row[0] if total_row else 0
-
-            one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-            cursor = await db.execute(
-                "SELECT COUNT(*) FROM sessions WHERE updated_at > ?",
-                (one_hour_ago,),
-            )
-            active_row = await cursor.fetchone()
-            active = active_row[0] if active_row else 0
-
-            cursor = await db.execute(
-                "SELECT MIN(created_at), MAX(updated_at) FROM sessions"
-            )
-            dates_row = await cursor.fetchone()
-            oldest = dates_row[0] if dates_row else None
-            newest = dates_row[1] if dates_row else None
-
-            # Count sessions per flow
-            cursor = await db.execute(
-                """
-                SELECT flow_name, COUNT(*) as count
-                FROM sessions
-                GROUP BY flow_name
-                """
-            )
-            flow_counts = {
-                row[0] or "unknown": row[1]
-                for row in await cursor.fetchall()
-            }
+        await self._flush_touches()
+
+        db = self._db
+        cursor = await db.execute(
+            """
+            SELECT
+                COUNT(*),
+                COUNT(CASE WHEN updated_at > ? THEN 1 END),
+                MIN(created_at),
+                MAX(updated_at)
+            FROM sessions
+            """,
+            (int(time.time()) - 3600,),
+        )
+        row = await cursor.fetchone()
+        total, active, oldest, newest = row if row else (0, 0, None, None)
+
+        # Count sessions per flow
+        cursor = await db.execute(
+            """
+            SELECT flow_name, COUNT(*) as count
+            FROM sessions
+            GROUP BY flow_name
+            """
+        )
+        flow_counts = {
+            row[0] or "unknown": row[1]
+            for row in await cursor.fetchall()
+        }
 
         return {
             "total_sessions": total,
             "active_last_hour": active,
-            "oldest_session": oldest,
-            "newest_activity": newest,
+            "oldest_session": _epoch_to_iso(oldest),
+            "newest_activity": _epoch_to_iso(newest),
             "sessions_per_flow": flow_counts,
         }
@@ -19,13 +19,16 @@ Admin commands (when mentioned):
 
 import asyncio
 import logging
-import re
 import shlex
 import time
+from collections import OrderedDict
 from typing import Optional, Set
 
+import aiohttp
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
+from slack_sdk.errors import SlackApiError
 from slack_sdk.web.async_client import AsyncWebClient
 
 from .config import Settings
@@ -37,16 +40,43 @@ from .langflow_client import (
     LangflowAPIError,
     LangflowError,
 )
-from .response_parser import format_for_slack
+from .response_parser import iter_slack_chunks
 
 logger = logging.getLogger(__name__)
 
+# Failures of a single chat.postMessage once slack_sdk's retries give up:
+# API errors plus transport errors and timeouts from the aiohttp session
+_SLACK_POST_ERRORS = (SlackApiError, aiohttp.ClientError, asyncio.TimeoutError)
+
+# Maximum processed-message keys kept for deduplication, regardless of age
+_PROCESSED_MAXSIZE = 10_000
+
 
 class SlackHandler:
     """Handles Slack events and bridges to Langflow."""
 
-    # Command patterns
-    COMMAND_PATTERN = re.compile(r"^(help|flows|channel)\b", re.IGNORECASE)
+    # First words that mark a mention as an admin command
+    COMMAND_WORDS = frozenset({"help", "flows", "channel"})
+
+    # Reply to the help command
+    HELP_TEXT = """*Available Commands:*
+
+*Flow Management:*
+- `flows` - List all configured flows
+- `flows add <name> <url> <flow_id> <api_key> [description]` - Add a new flow
+- `flows remove <name>` - Remove a flow
+- `flows default <name>` - Set the default flow
+- `flows info <name>` - Show flow details
+
+*Channel Configuration:*
+- `channel info` - Show this channel's flow configuration
+- `channel set <flow_name>` - Set this channel to use a specific flow
+- `channel reset` - Remove channel-specific flow (use default)
+
+*General:*
+- `help` - Show this message
+
+Any other message will be sent to the configured Langflow agent."""
 
     def __init__(
         self,
@@ -69,18 +99,37 @@ class SlackHandler:
         self.flow_manager = flow_manager
         self.client_manager = client_manager
 
-        # Track which threads the bot has participated in
-        self._bot_threads: Set[str] = set()
         # Track messages currently being processed to avoid duplicates
         self._processing: Set[str] = set()
-        # Track recently processed messages (message_key -> timestamp)
-        self._processed_messages: dict[str, float] = {}
+        # Track recently processed messages (message_key -> timestamp), kept
+        # in timestamp order so expired entries are always at the front
+        self._processed_messages: OrderedDict[str, float] = OrderedDict()
         # How long to remember processed messages (in seconds)
         self._dedup_window: int = 60
+        # Bounds concurrent Langflow runs so bursts queue instead of fanning out
+        self._langflow_semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+
+        # Without a session, slack_sdk opens a new aiohttp session (and TLS
+        # connection) for every API call; share one pooled session instead.
+        # Bolt's per-event clients reuse the app client's session.
+        self._http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(
+                limit=100, ttl_dns_cache=300, keepalive_timeout=60
+            ),
+        )
 
-        # Initialize Slack app
+        # Initialize Slack app. Its own client is configured in place rather
+        # than passing client=, since Bolt also reads SLACK_BOT_TOKEN from the
+        # environment and warns that the token is unused when both are set.
         self.app = AsyncApp(token=settings.slack_bot_token)
+        self.app.client.session = self._http_session
+        # Also retry once on rate limiting, honoring Retry-After
+        self.app.client.retry_handlers.append(
+            AsyncRateLimitErrorRetryHandler(max_retry_count=1)
+        )
         self._bot_user_id: Optional[str] = None
+        self._socket_handler: Optional[AsyncSocketModeHandler] = None
 
         # Register event handlers
         self._register_handlers()
@@ -118,10 +167,8 @@ class SlackHandler:
         Returns:
             Cleaned message text without the bot mention.
         """
-        # Remove <@BOTID> mention pattern
-        pattern = f"<@{bot_user_id}>"
-        cleaned = re.sub(pattern, "", text).strip()
-        return cleaned
+        # Remove <@BOTID> mention (a fixed literal, so no regex needed)
+        return text.replace(f"<@{bot_user_id}>", "").strip()
 
     def _make_message_key(self, channel: str, ts: str) -> str:
         """Create a unique key for a message to track processing state."""
@@ -129,14 +176,15 @@ class SlackHandler:
 
     def _is_command(self, text: str) -> bool:
         """Check if the message is an admin command."""
-        return bool(self.COMMAND_PATTERN.match(text.strip()))
+        head = text.split(None, 1)
+        return bool(head) and head[0].lower() in self.COMMAND_WORDS
 
     def _cleanup_processed_messages(self, current_time: float) -> None:
         """Remove old entries from the processed messages dict."""
         cutoff = current_time - self._dedup_window
-        expired = [k for k, v in self._processed_messages.items() if v < cutoff]
-        for k in expired:
-            del self._processed_messages[k]
+        processed = self._processed_messages
+        while processed and next(iter(processed.values())) < cutoff:
+            processed.popitem(last=False)
 
     async def _handle_message(
         self,
@@ -159,6 +207,32 @@ class SlackHandler:
         user = event.get("user", "")
         channel_type = event.get("channel_type", "")
 
+        # Use thread_ts if in a thread, otherwise use ts (this message starts a thread)
+        effective_thread_ts = thread_ts or ts
+        thread_key = self._make_message_key(channel, effective_thread_ts)
+
+        if not text.strip():
+            logger.debug("Ignoring empty message")
+            return
+
+        # Always process mentions and DMs; other messages only if they are
+        # thread replies in a thread the bot participated in (i.e. one with a
+        # session). Checked early since most channel traffic isn't for the bot.
+        if not (is_mention or channel_type == "im"):
+            if not thread_ts or not await self.session_manager.has_session(
+                channel, thread_ts
+            ):
+                return
+
+        # Get bot user ID. All awaits must come before the duplicate checks:
+        # from there to _processing.add() nothing may yield to the event loop,
+        # or two deliveries of one message could both pass the checks.
+        bot_user_id = await self._get_bot_user_id(client)
+
+        # Skip bot's own messages
+        if user == bot_user_id:
+            return
+
         # Create a unique key for this message
         message_key = self._make_message_key(channel, ts)
 
@@ -177,44 +251,6 @@ class SlackHandler:
         # Cleanup old entries from processed messages dict
         self._cleanup_processed_messages(current_time)
 
-        # Get bot user ID
-        bot_user_id = await self._get_bot_user_id(client)
-
-        # Skip bot's own messages
-        if user == bot_user_id:
-            return
-
-        # Determine if we should process this message
-        should_process = False
-        thread_key = None
-
-        if is_mention:
-            # Always process mentions
-            should_process = True
-            # Use thread_ts if in a thread, otherwise use ts (this message starts a thread)
-            effective_thread_ts = thread_ts or ts
-            thread_key = self._make_message_key(channel, effective_thread_ts)
-
-        elif channel_type == "im":
-            # Always process DMs
-            should_process = True
-            effective_thread_ts = thread_ts or ts
-            thread_key = self._make_message_key(channel, effective_thread_ts)
-
-        elif thread_ts:
-            # This is a thread reply - only process if bot participated
-            thread_key = self._make_message_key(channel, thread_ts)
-            if thread_key in self._bot_threads:
-                should_process = True
-                effective_thread_ts = thread_ts
-
-        if not should_process:
-            return
-
-        if not text.strip():
-            logger.debug("Ignoring empty message")
-            return
-
         # Mark as processing
         self._processing.add(message_key)
 
@@ -230,13 +266,14 @@ class SlackHandler:
                 await self._handle_command(client, channel, ts, user, cleaned_text)
                 return
 
-            logger.info(
-                "Processing message | channel=%s | thread=%s | user=%s | text=%s",
-                channel,
-                thread_key,
-                user,
-                cleaned_text[:100],
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Processing message | channel=%s | thread=%s | user=%s | text=%s",
+                    channel,
+                    thread_key,
+                    user,
+                    cleaned_text[:100],
+                )
 
             # Get the flow for this channel
             flow_config = await self.flow_manager.get_channel_flow(channel)
@@ -244,14 +281,13 @@ class SlackHandler:
                 await self._send_error_message(
                     client,
                     channel,
-                    thread_ts or ts,
+                    effective_thread_ts,
                     "No flow configured for this channel. "
                     "Ask an admin to configure one with: `@bot flows add ...`",
                 )
                 return
 
             # Get or create session
-            effective_thread_ts = thread_ts or ts
             session_info = await self.session_manager.get_or_create_session(
                 channel, effective_thread_ts, flow_config.name
             )
@@ -269,39 +305,23 @@ class SlackHandler:
             # Get the client for this flow
             langflow_client = self.client_manager.get_client(flow_config)
 
-            # Start typing indicator task
-            typing_task = asyncio.create_task(
-                self._maintain_typing_indicator(client, channel, effective_thread_ts)
-            )
-
-            try:
-                # Send to Langflow
+            # Send to Langflow
+            async with self._langflow_semaphore:
                 response_text = await langflow_client.send_message(
                     cleaned_text, session_info.session_id
                 )
 
-                # Mark thread as bot-participated
-                self._bot_threads.add(thread_key)
-
-                # Send response
-                await self._send_response(
-                    client, channel, effective_thread_ts, response_text
-                )
-
-            finally:
-                # Stop typing indicator
-                typing_task.cancel()
-                try:
-                    await typing_task
-                except asyncio.CancelledError:
-                    pass
+            # Send response
+            await self._send_response(
+                client, channel, effective_thread_ts, response_text
+            )
 
         except LangflowTimeoutError:
             logger.error("Langflow timeout for message %s", message_key)
             await self._send_error_message(
                 client,
                 channel,
-                thread_ts or ts,
+                effective_thread_ts,
                 "The agent is taking longer than expected. Please try again.",
             )
 
@@ -312,7 +332,7 @@ class SlackHandler:
             await self._send_error_message(
                 client,
                 channel,
-                thread_ts or ts,
+                effective_thread_ts,
                 "There was an error processing your message. Please try again.",
             )
 
@@ -323,7 +343,7 @@ class SlackHandler:
             await self._send_error_message(
                 client,
                 channel,
-                thread_ts or ts,
+                effective_thread_ts,
                 "There was an error communicating with the agent. Please try again.",
             )
 
@@ -332,15 +352,19 @@ class SlackHandler:
             await self._send_error_message(
                 client,
                 channel,
-                thread_ts or ts,
+                effective_thread_ts,
                 "An unexpected error occurred. Please try again.",
             )
 
         finally:
             # Remove from processing set
             self._processing.discard(message_key)
-            # Mark as processed for deduplication
+            # Mark as processed for deduplication (re-inserted at the end
+            # to keep the dict in timestamp order)
+            self._processed_messages.pop(message_key, None)
             self._processed_messages[message_key] = time.time()
+            if len(self._processed_messages) > _PROCESSED_MAXSIZE:
+                self._processed_messages.popitem(last=False)
 
     async def _handle_command(
         self,
@@ -360,9 +384,13 @@ class SlackHandler:
             user: User ID who sent the command.
             text: Command text.
         """
-        try:
-            parts = shlex.split(text)
-        except ValueError:
+        # Only run the shlex lexer when there is quoting or escaping to honour
+        if '"' in text or "'" in text or "\\" in text:
+            try:
+                parts = shlex.split(text)
+            except ValueError:
+                parts = text.split()
+        else:
             parts = text.split()
 
         if not parts:
@@ -390,29 +418,39 @@ class SlackHandler:
                 client, channel, ts, f"Error executing command: {e}"
             )
 
+    async def _require_admin(
+        self,
+        client: AsyncWebClient,
+        channel: str,
+        ts: str,
+        user: str,
+        action: str,
+    ) -> bool:
+        """
+        Check that a user is an admin, telling them if they are not.
+
+        Args:
+            client: Slack web client.
+            channel: Channel ID.
+            ts: Message timestamp.
+            user: User ID who sent the command.
+            action: What the command does, for the refusal message.
+
+        Returns:
+            True if the user is an admin, False otherwise.
+        """
+        if self.settings.is_admin(user):
+            return True
+        await self._send_message(
+            client, channel, ts, f":no_entry: You don't have permission to {action}."
+        )
+        return False
+
     async def _cmd_help(
         self, client: AsyncWebClient, channel: str, ts: str
     ) -> None:
         """Show help message."""
-        help_text = """*Available Commands:*
-
-*Flow Management:*
-- `flows` - List all configured flows
-- `flows add <name> <url> <flow_id> <api_key> [description]` - Add a new flow
-- `flows remove <name>` - Remove a flow
-- `flows default <name>` - Set the default flow
-- `flows info <name>` - Show flow details
-
-*Channel Configuration:*
-- `channel info` - Show this channel's flow configuration
-- `channel set <flow_name>` - Set this channel to use a specific flow
-- `channel reset` - Remove channel-specific flow (use default)
-
-*General:*
-- `help` - Show this message
-
-Any other message will be sent to the configured Langflow agent."""
-        await self._send_message(client, channel, ts, help_text)
+        await self._send_message(client, channel, ts, self.HELP_TEXT)
 
     async def _cmd_flows(
         self,
@@ -445,10 +483,7 @@ Any other message will be sent to the configured Langflow agent."""
 
         if subcommand == "add":
             # Check admin permission
-            if not self.settings.is_admin(user):
-                await self._send_message(
-                    client, channel, ts, ":no_entry: You don't have permission to add flows."
-                )
+            if not await self._require_admin(client, channel, ts, user, "add flows"):
                 return
 
             if len(args) < 5:
@@ -479,10 +514,7 @@ Any other message will be sent to the configured Langflow agent."""
                 )
 
         elif subcommand == "remove":
-            if not self.settings.is_admin(user):
-                await self._send_message(
-                    client, channel, ts, ":no_entry: You don't have permission to remove flows."
-                )
+            if not await self._require_admin(client, channel, ts, user, "remove flows"):
                 return
 
             if len(args) < 2:
@@ -493,7 +525,7 @@ Any other message will be sent to the configured Langflow agent."""
 
             name = args[1]
             success = await self.flow_manager.remove_flow(name)
-            self.client_manager.invalidate(name)
+            await self.client_manager.invalidate(name)
 
             if success:
                 await self._send_message(
@@ -505,10 +537,7 @@ Any other message will be sent to the configured Langflow agent."""
                 )
 
         elif subcommand == "default":
-            if not self.settings.is_admin(user):
-                await self._send_message(
-                    client, channel, ts, ":no_entry: You don't have permission to set default flow."
-                )
+            if not await self._require_admin(client, channel, ts, user, "set default flow"):
                 return
 
             if len(args) < 2:
@@ -596,10 +625,7 @@ Any other message will be sent to the configured Langflow agent."""
                 )
 
         elif subcommand == "set":
-            if not self.settings.is_admin(user):
-                await self._send_message(
-                    client, channel, ts, ":no_entry: You don't have permission to configure channels."
-                )
+            if not await self._require_admin(client, channel, ts, user, "configure channels"):
                 return
 
             if len(args) < 2:
@@ -623,10 +649,7 @@ Any other message will be sent to the configured Langflow agent."""
                 )
 
         elif subcommand == "reset":
-            if not self.settings.is_admin(user):
-                await self._send_message(
-                    client, channel, ts, ":no_entry: You don't have permission to configure channels."
-                )
+            if not await self._require_admin(client, channel, ts, user, "configure channels"):
                 return
 
             success = await self.flow_manager.remove_channel_flow(channel)
@@ -655,26 +678,6 @@ Any other message will be sent to the configured Langflow agent."""
                 f"Unknown subcommand: `{subcommand}`. Try `channel info`, `channel set`, or `channel reset`."
             )
 
-    async def _maintain_typing_indicator(
-        self,
-        client: AsyncWebClient,
-        channel: str,
-        thread_ts: str,
-    ) -> None:
-        """
-        Maintain the typing indicator while processing.
-
-        Args:
-            client: Slack web client.
-            channel: Channel ID.
-            thread_ts: Thread timestamp.
-        """
-        try:
-            while True:
-                await asyncio.sleep(2)
-        except asyncio.CancelledError:
-            pass
-
     async def _send_message(
         self,
         client: AsyncWebClient,
@@ -704,6 +707,10 @@ Any other message will be sent to the configured Langflow agent."""
             channel: Channel ID.
             thread_ts: Thread timestamp.
             text: Response text.
+
+        Raises:
+            SlackApiError, aiohttp.ClientError, asyncio.TimeoutError: If no
+                chunk of the response could be posted.
         """
         if not text:
             await self._send_error_message(
@@ -714,25 +721,33 @@ Any other message will be sent to the configured Langflow agent."""
             )
             return
 
-        # Split long messages
-        chunks = format_for_slack(text)
-
-        for i, chunk in enumerate(chunks):
+        # Split long messages, posting each chunk as it is produced. A chunk
+        # that fails (after the client's own retries) is logged and skipped
+        # so one bad post doesn't drop the rest of the reply.
+        delivered = 0
+        last_error: Optional[Exception] = None
+        for i, chunk in enumerate(iter_slack_chunks(text), start=1):
             try:
                 await client.chat_postMessage(
                     channel=channel,
                     thread_ts=thread_ts,
                     text=chunk,
                 )
+                delivered += 1
                 logger.debug(
-                    "Sent response chunk %d/%d to channel %s",
-                    i + 1,
-                    len(chunks),
+                    "Sent response chunk %d to channel %s",
+                    i,
                     channel,
                 )
-            except Exception as e:
-                logger.error("Failed to send message to Slack: %s", e)
-                raise
+            except _SLACK_POST_ERRORS as e:
+                last_error = e
+                logger.error(
+                    "Failed to send response chunk %d to Slack: %s", i, e
+                )
+
+        # Nothing reached the user: let the caller report the failure
+        if delivered == 0 and last_error is not None:
+            raise last_error
 
     async def _send_error_message(
         self,
@@ -761,10 +776,20 @@ Any other message will be sent to the configured Langflow agent."""
 
     async def start(self) -> None:
         """Start the Socket Mode handler."""
-        handler = AsyncSocketModeHandler(self.app, self.settings.slack_app_token)
+        # Resolve the bot user ID up front so the first message doesn't wait
+        # on an auth.test round trip
+        await self._get_bot_user_id(self.app.client)
+
+        self._socket_handler = AsyncSocketModeHandler(
+            self.app, self.settings.slack_app_token
+        )
         logger.info("Starting Slack Socket Mode handler...")
-        await handler.start_async()
+        await self._socket_handler.start_async()
 
     async def cleanup(self) -> None:
         """Cleanup resources."""
+        if self._socket_handler is not None:
+            await self._socket_handler.close_async()
+            self._socket_handler = None
+        await self._http_session.close()
         await self.client_manager.close_all()
@@ -0,0 +1,46 @@
+"""Tests for settings validation."""
+
+import unittest
+import unittest.mock
+
+from pydantic import ValidationError
+
+from src.config import Settings
+
+
+class MaxConcurrentRequestsTest(unittest.TestCase):
+    """MAX_CONCURRENT_REQUESTS must allow at least one Langflow run."""
+
+    def _settings(self, **kwargs) -> Settings:
+        return Settings(
+            _env_file=None,
+            slack_bot_token="xoxb-test",
+            slack_app_token="xapp-test",
+            **kwargs,
+        )
+
+    def test_default(self):
+        self.assertEqual(self._settings().max_concurrent_requests, 10)
+
+    def test_zero_rejected(self):
+        with self.assertRaises(ValidationError):
+            self._settings(max_concurrent_requests=0)
+
+    def test_negative_rejected(self):
+        with self.assertRaises(ValidationError):
+            self._settings(max_concurrent_requests=-1)
+
+    def test_zero_from_env_rejected(self):
+        with unittest.mock.patch.dict(
+            "os.environ", {"MAX_CONCURRENT_REQUESTS": "0"}
+        ):
+            with self.assertRaises(ValidationError):
+                Settings(
+                    _env_file=None,
+                    slack_bot_token="xoxb-test",
+                    slack_app_token="xapp-test",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
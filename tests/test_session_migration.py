@@ -0,0 +1,127 @@
+"""Tests for upgrading legacy sessions databases."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+import unittest.mock
+from datetime import datetime, timezone
+
+from src.session_manager import SessionManager
+
+CREATED = datetime(2024, 1, 2, 3, 4, 5, 678901)
+UPDATED = datetime(2024, 1, 3, 4, 5, 6, 789012)
+
+
+def _epoch(value: datetime) -> int:
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+class LegacySchemaMigrationTest(unittest.IsolatedAsyncioTestCase):
+    """initialize() converts the original rowid/TIMESTAMP sessions table."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.path = os.path.join(self._tmpdir.name, "sessions.db")
+
+    def _create_legacy_db(self, with_flow_name: bool) -> None:
+        """Build the baseline schema, with rows written as utcnow() did."""
+        flow_column = "flow_name TEXT," if with_flow_name else ""
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            f"""
+            CREATE TABLE sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                thread_key TEXT UNIQUE NOT NULL,
+                session_id TEXT NOT NULL,
+                {flow_column}
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.execute("CREATE INDEX idx_thread_key ON sessions(thread_key)")
+        # str() matches what sqlite3's default datetime adapter stored
+        rows = [
+            ("C1:1.0", "s-1", "flow-a"),
+            ("C1:2.0", "s-2", None),
+        ]
+        for thread_key, session_id, flow_name in rows:
+            if with_flow_name:
+                conn.execute(
+                    "INSERT INTO sessions (thread_key, session_id, flow_name,"
+                    " created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (thread_key, session_id, flow_name, str(CREATED), str(UPDATED)),
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO sessions (thread_key, session_id,"
+                    " created_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (thread_key, session_id, str(CREATED), str(UPDATED)),
+                )
+        conn.commit()
+        conn.close()
+
+    def _query(self, sql: str) -> list:
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+    async def _initialize(self) -> None:
+        manager = SessionManager(self.path)
+        await manager.initialize()
+        await manager.close()
+
+    async def _assert_migrated(self, expected_flows: dict) -> None:
+        await self._initialize()
+
+        rows = self._query(
+            "SELECT thread_key, session_id, flow_name, created_at, updated_at"
+            " FROM sessions ORDER BY thread_key"
+        )
+        self.assertEqual(
+            rows,
+            [
+                (key, sid, expected_flows[key], _epoch(CREATED), _epoch(UPDATED))
+                for key, sid in (("C1:1.0", "s-1"), ("C1:2.0", "s-2"))
+            ],
+        )
+        self.assertEqual(self._query("PRAGMA user_version"), [(2,)])
+
+        indexes = {row[0] for row in self._query(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+            " AND tbl_name = 'sessions'"
+        )}
+        self.assertNotIn("idx_thread_key", indexes)
+        self.assertIn("idx_updated_at", indexes)
+
+        # The schema is current now, so reopening must not migrate again
+        with unittest.mock.patch.object(SessionManager, "_migrate") as migrate:
+            await self._initialize()
+        migrate.assert_not_called()
+
+    async def test_migrates_table_with_flow_name(self):
+        self._create_legacy_db(with_flow_name=True)
+        await self._assert_migrated({"C1:1.0": "flow-a", "C1:2.0": None})
+
+    async def test_migrates_table_without_flow_name(self):
+        self._create_legacy_db(with_flow_name=False)
+        await self._assert_migrated({"C1:1.0": None, "C1:2.0": None})
+
+    async def test_migrated_sessions_are_found(self):
+        self._create_legacy_db(with_flow_name=True)
+        manager = SessionManager(self.path)
+        await manager.initialize()
+        try:
+            session = await manager.get_session("C1", "1.0")
+        finally:
+            await manager.close()
+        self.assertEqual(session.session_id, "s-1")
+        self.assertEqual(session.flow_name, "flow-a")
+
+
+if __name__ == "__main__":
+    unittest.main()